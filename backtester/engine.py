@@ -6,11 +6,16 @@ There will be a
 """
 
 from typing import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass
 import logging
+import multiprocessing
+import os
 import pandas as pd
 import numpy as np
+from numba import njit, prange, typed, types
+
+logger = logging.getLogger(__name__)
 
 
 class Engine:
@@ -32,25 +37,42 @@ class Engine:
         context=None,
     ):
         self.data = timeseries
-        # Construct numpy arrays from the dataframe for access speeds
-        self.opens = self.data["Open"].values
-        self.closes = self.data["Adj Close"].values
+        # Split the dataframe into raw per-field ndarrays once so that neither
+        # the hot loop nor the strategy input goes through Pandas dispatch.
+        # float32 gives ample precision for daily prices and halves the bytes
+        # moved through cache per timestep; only the cash curve accumulates,
+        # so only it stays float64.
+        self._cols = {}
+        for name in self.data.columns.get_level_values(0).unique():
+            arr = self.data[name].to_numpy()
+            if np.issubdtype(arr.dtype, np.number):
+                arr = np.ascontiguousarray(arr.astype(np.float32, copy=False))
+            self._cols[name] = arr
+        self.opens = self._cols["Open"]
+        self.closes = self._cols["Adj Close"]
 
         self.cash = np.zeros(len(timeseries))
         self.cash[0] = initial_amount
         self.strategy = user_strategy
         self.context = context
         self.pos_id = 0
-        self.history = pd.DataFrame(
-            columns=["symbol", "open_price", "shares", "close_price", "PnL"]
-        )
         # Vector tickers, with orders and trades in order of shown tickers
         self.tickers = [ticker for ticker in self.data["Adj Close"].columns]
+        # O(1) ticker name to column index lookup, avoiding Index.get_loc; the
+        # numba typed counterpart is built lazily on first access
+        self.ticker_to_col = {ticker: k for k, ticker in enumerate(self.tickers)}
+        self._typed_ticker_to_col = None
+        # Every trade is recorded here; sized for one trade per ticker per day
+        self.history = TradeHistory(len(timeseries) * len(self.tickers))
         # Order vector contains number of shares to be traded
-        self.orders = np.zeros(len(self.tickers))
+        self.orders = np.zeros(len(self.tickers), dtype=np.float32)
         # self.trades = np.zeros(len(self.tickers))
         self.trades = Trade(len(self.tickers))
 
+        # Scratch buffer the user alphas are copied into before being handed
+        # to the jitted kernel
+        self._alphas = np.zeros(len(self.tickers), dtype=np.float32)
+
         # Data capture
         self.out_cash = np.zeros(len(timeseries))
 
@@ -64,44 +86,112 @@ class Engine:
         sufficient for them to occur together.
 
         The positions are closed at the end of the trading day. Orders are also placed at the
-        same time. Then positions are opened on the morning of the next trading day
+        same time. Then positions are opened on the morning of the next trading day.
+
+        The user strategy runs in Python; all of the numeric bookkeeping for the
+        timestep is fused into the jitted ``_step`` kernel.
         """
-        for i in range(len(self.data)):
-            logging.debug(f"Progress: {i/len(self.data)*100.:.2f}%")
-            # Evening of i-th day
-            # Close-out previous positions and adjust cash
-            self._close_positions(i)
-            # Store output data
-            # self._store_outputs(i)
-            # Use closing price of the i-th day
+        # The loop never touches the dataframe itself, only the raw arrays.
+        # The debug guard keeps the progress string from being formatted on
+        # every iteration when nobody is listening.
+        n_steps = self.closes.shape[0]
+        log_progress = logger.isEnabledFor(logging.DEBUG)
+        for i in range(n_steps):
+            if log_progress:
+                logger.debug("Progress: %.2f%%", i / n_steps * 100.0)
+            # Evening of i-th day: record the close-out of the trades opened on
+            # the previous morning before the kernel clears them
+            open_idx = np.flatnonzero(self.trades.open_mask())
+            if open_idx.size:
+                pnl = (
+                    self.closes[i, open_idx] - self.trades.price[open_idx]
+                ) * self.trades.shares[open_idx]
+                self.history.close(
+                    self.trades.id[open_idx].astype(np.int64),
+                    self.closes[i, open_idx],
+                    pnl,
+                )
+            # The strategy sees data up to and including i
             self._place_orders(i)
-            # Morning of i+1-th day
-            self._place_trades(i)
+            # Close-out previous positions, size the orders and open the i+1-th
+            # morning's trades in one fused pass over the universe
+            _step(
+                i,
+                self.closes,
+                self.opens,
+                self.cash,
+                self.trades.price,
+                self.trades.shares,
+                self.orders,
+                self._alphas,
+            )
+            # Record the newly opened trades; their ids index into the history
+            placed = np.flatnonzero(self.trades.open_mask())
+            if placed.size:
+                self.trades.id[placed] = self.history.open(
+                    placed, self.trades.price[placed], self.trades.shares[placed]
+                )
+                self.pos_id = len(self.history)
 
         # Model is now complete, run a post-processer
 
-    def _close_positions(self, i: int) -> None:
-        """Goes through all positions and closes them out.
-
-        The positions are closed at the end of the trading day, using the i-th
-        datapoint.
+    @property
+    def typed_ticker_to_col(self) -> typed.Dict:
+        """Ticker to column index map usable inside numba-jitted strategies.
 
+        Jitted code cannot hold a Python dict, so the mapping is mirrored into
+        a ``numba.typed.Dict`` keyed on unicode ticker names. It is built on
+        first access since the plain ``ticker_to_col`` covers Python callers.
+        """
+        if self._typed_ticker_to_col is None:
+            mapping = typed.Dict.empty(types.unicode_type, types.int64)
+            for ticker, k in self.ticker_to_col.items():
+                mapping[ticker] = k
+            self._typed_ticker_to_col = mapping
+        return self._typed_ticker_to_col
+
+    @staticmethod
+    def run_many(
+        strategies: list,
+        initial_amounts: float | Iterable,
+        timeseries: pd.DataFrame,
+        contexts: list | None = None,
+        max_workers: int | None = None,
+    ) -> list:
+        """Run several backtests over the same timeseries in parallel.
+
+        A single backtest is sequential in time, but independent strategies or
+        parameter sweeps are embarrassingly parallel, and each run is CPU
+        bound in the jitted kernel, so the work is sharded across processes
+        rather than threads. The timeseries is pickled to each worker exactly
+        once by the pool initialiser rather than once per task. Strategies
+        must be module-level functions so they can be pickled.
 
         Args:
-            i (int): The current time period index.
+            strategies (list): The user strategy functions, one per backtest.
+            initial_amounts (float | Iterable): Starting cash, either shared
+             or one amount per strategy.
+            timeseries (pd.DataFrame): The timeseries all backtests run over.
+            contexts (list | None): Optional per-strategy context objects.
+            max_workers (int | None): Process count, defaulted to core count.
+
+        Returns:
+            list: The cash curve of each backtest, in strategy order.
         """
-        # Close position and add to history
-        for i_ticker in range(len(self.tickers)):
-            if self.trades.open_trade(i_ticker):
-                close = self.closes[i, i_ticker]
-                pnl = (close - self.trades.price[i_ticker]) * self.trades.shares[
-                    i_ticker
-                ]
-                # Adjust cash by value of trade with and PnL generated
-                self.cash[i] += abs(self.trades.value(i_ticker)) + pnl
-                # self.history.loc[self.trades.id[i], ["close_price", "PnL"]] = [close, pnl]
-        # Closing out
-        self.trades.clear()
+        if not isinstance(initial_amounts, Iterable):
+            initial_amounts = [initial_amounts] * len(strategies)
+        if contexts is None:
+            contexts = [None] * len(strategies)
+
+        # Workers must be spawned: the numba parallel runtime in this process
+        # does not survive a fork and deadlocks the host at shutdown
+        with ProcessPoolExecutor(
+            max_workers=max_workers or min(os.cpu_count(), len(strategies)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(timeseries,),
+        ) as pool:
+            return list(pool.map(_run_worker, initial_amounts, strategies, contexts))
 
     def _place_orders(self, i: int) -> None:
         """Use the user supplied strategy to create alpha signals which are used to
@@ -113,6 +203,9 @@ class Engine:
         calculated so that the available cash is distributed according to these alphas.
         Both long and short positions are equally weighted.
 
+        The alphas are validated and copied into the pre-allocated scratch buffer
+        here; the normalisation and order sizing happen inside ``_step``.
+
         Args:
             i (int): The current time period index.
 
@@ -121,7 +214,9 @@ class Engine:
              detected.
         """
         # Can't place orders on first data entry point because we do not have previous day's close
-        alphas = self.strategy(self.data.loc[:i, :], self.context)
+        alphas = self.strategy(
+            DataView(self._cols, i, self.ticker_to_col), self.context
+        )
 
         # Perform some checks on the user response to make sure it satisfies requirements
         if not isinstance(alphas, Iterable) or len(alphas) != len(self.tickers):
@@ -129,66 +224,9 @@ class Engine:
                 f"the user-function {self.strategy} must return alpha vector of same length ticker count"
             )
 
-        # Fill any NaN values with zeros
-        alphas[np.isnan(alphas)] = 0.0
-        # Transform the alphas onto a -1 to +1 range. Integral of position should be total cash available.
-        alphas = 2 * (alphas - np.min(alphas)) / (np.max(alphas) - np.min(alphas)) - 1
-
-        # Calculate the number of shares to be bought using the current opening price
-        # Total alpha
-        total = np.sum(np.abs(alphas))
-        # Adjust available cash if there must be a minimum in cash account
-        available_cash = self.cash[i]
-
-        # The total value of each position in the universe
-        value = (alphas / total) * available_cash
-        # Number of shares is then the value / closing price of the day.
-        nshares = value / self.closes[i, :]
-        # Create the orders
-        self.orders = nshares
-        # self.orders += [Order(tick, share) for tick, share in zip(self.tickers, nshares)]
-
-    def _place_trades(self, i: int) -> None:
-        """Goes through all orders and attempts to place the trade using the open price
-        for the next morning, i.e. i+1-th day.
-
-        An eligibility check is performed to ensure that there is sufficient capital to
-        place a trade. If there are numerous overnight changes in stock price, some
-        trades may not be placed.
-
-        TODO: Add a feature for fixed to approximate remaining capital so that the user
-        can fulfill all trades if there must be fixed remaining cash in the trading
-        account, but there is some leeway.
-
-        Args:
-            i (int): The current time period index.
-        """
-        # Move cash over to next morning if there is a next morning
-        if len(self.cash) == i + 1:
-            return
-        else:
-            self.cash[i + 1] = self.cash[i]
-
-        # Convert orders at previous day's closing to trades using todays open price
-        for i_ticker, order in enumerate(self.orders):
-            open_price = self.opens[i + 1, i_ticker]
-            # if order.eligible(open_price, self.cash):
-            if eligible(order, open_price, self.cash[i + 1]):
-                # Place the trade and reduce available cash in the account
-                self.trades.id[i_ticker] = self.pos_id
-                self.trades.price[i_ticker] = open_price
-                self.trades.shares[i_ticker] = order
-                self.cash[i + 1] -= abs(self.trades.value(i_ticker))
-                # Add open trade to trade history
-                # self.history.loc[self.pos_id] = [
-                #     t.ticker,
-                #     t.price,
-                #     t.shares,
-                #     None,
-                #     None,
-                # ]
-                # increment trade counter
-                self.pos_id += 1
+        np.copyto(self._alphas, alphas)
+        # Fill any NaN values with zeros, in place and without a mask
+        np.nan_to_num(self._alphas, copy=False, nan=0.0)
 
     def _store_outputs(self, i: int) -> None:
         """Store required outputs used for post-processing.
@@ -200,73 +238,253 @@ class Engine:
         self.out_cash[i] = self.cash
 
 
-class Trade:
+# Timeseries shared by the run_many worker processes, set once per worker by
+# the pool initialiser
+_WORKER_TIMESERIES = None
 
-    def __init__(self, universe_size: int) -> None:
-        self.id = np.zeros(universe_size)
-        self.price = np.zeros(universe_size)
-        self.shares = np.zeros(universe_size)
 
-    def value(self, i: int):
-        return self.price[i] * self.shares[i]
+def _init_worker(timeseries: pd.DataFrame) -> None:
+    """Store the shared timeseries in the worker process."""
+    global _WORKER_TIMESERIES
+    _WORKER_TIMESERIES = timeseries
+
+
+def _run_worker(initial_amount: float, strategy, context) -> np.ndarray:
+    """Build and run one Engine against the worker's shared timeseries."""
+    model = Engine(initial_amount, _WORKER_TIMESERIES, strategy, context=context)
+    model.run()
+    return model.cash
+
+
+class DataView:
+    """Zero-copy, point-in-time view of the engine timeseries.
+
+    Strategies receive one of these rather than a ``.loc`` copy of the
+    dataframe, whose construction cost grows with the timestep and makes a run
+    O(T^2). Indexing by a top-level field name (e.g. ``view["Adj Close"]``)
+    returns the raw ndarray of that field for every ticker, truncated to the
+    timesteps seen so far. The slice is a view into the engine's own arrays
+    and must not be mutated. Strategies that need the full ``pd.DataFrame``
+    can hold onto it themselves and slice it with ``.iloc[:len(view)]``.
+    """
+
+    def __init__(self, cols: dict, i: int, ticker_to_col: dict | None = None) -> None:
+        self._cols = cols
+        self._i = i
+        self._ticker_to_col = ticker_to_col
+
+    def __len__(self) -> int:
+        return self._i + 1
 
-    def open_trade(self, i: int) -> bool:
-        """Checks whether the shares are non-zero to see if a trade is open.
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._cols[key][: self._i + 1]
+
+    def column(self, field: str, ticker: str) -> np.ndarray:
+        """Single-ticker slice of a field, resolved through the O(1) name map.
 
         Args:
-            i (int): The ticker index.
+            field (str): The top-level field name, e.g. ``"Adj Close"``.
+            ticker (str): The ticker whose column is wanted.
 
         Returns:
-            bool: True if trade is open and False otherwise.
+            np.ndarray: View of that ticker's series up to the current step.
         """
-        return abs(self.shares[i]) > 1e-6
+        return self._cols[field][: self._i + 1, self._ticker_to_col[ticker]]
 
-    def clear(self):
-        """Clear all trade entries."""
-        self.id[:] = 0.0
-        self.price[:] = 0.0
-        self.shares[:] = 0.0
 
+@njit("float64(float32[:])", cache=True, fastmath=True)
+def _normalize_alphas(alphas):
+    """Map the (NaN-cleaned) alphas onto a -1 to +1 range, in place.
 
-def eligible(shares: float, price: float, cash: float) -> bool:
-    """Checks whether the order can be placed.
+    Both extrema come from one fused scan and the normalisation accumulates
+    the total |alpha| as it writes, so the buffer is read twice in total where
+    separate np.min/np.max/np.sum(np.abs) calls would read it four times.
 
-    When trying to long a position, we need enough cash. When trying to short,
-    we also need to make sure that we have enough cash for it.
+    Returns:
+        float: The total |alpha|, or 0.0 when the vector is flat.
+    """
+    n_tickers = alphas.shape[0]
+    amin = alphas[0]
+    amax = alphas[0]
+    for k in range(n_tickers):
+        if alphas[k] < amin:
+            amin = alphas[k]
+        if alphas[k] > amax:
+            amax = alphas[k]
+    span = amax - amin
+
+    # A flat vector cannot be scaled onto the range
+    if span == 0.0:
+        return 0.0
+
+    total = 0.0
+    for k in range(n_tickers):
+        alphas[k] = 2.0 * (alphas[k] - amin) / span - 1.0
+        total += abs(alphas[k])
+    return total
+
+
+# Explicit signature so the kernel is compiled at import rather than on the
+# first timestep. The per-ticker buffers are float32 to halve the memory
+# bandwidth per step; the cash curve is the one accumulator and stays float64
+# so no drift builds up over long runs.
+_STEP_SIGNATURE = (
+    "void(int64, float32[:, :], float32[:, :], float64[:], float32[:], "
+    "float32[:], float32[:], float32[:])"
+)
+
+
+@njit(_STEP_SIGNATURE, cache=True, fastmath=True, parallel=True)
+def _step(i, close, open_, cash, trades_price, trades_shares, orders, alphas):
+    """Numeric bookkeeping for a single timestep, fused into one jitted pass.
+
+    Closes out the open positions at the i-th close, sizes new orders from the
+    (NaN-cleaned) alphas, and opens the eligible trades at the i+1-th open.
+    The loops over the ticker axis are parallelised with ``prange``.
+    """
+    n_tickers = trades_shares.shape[0]
+    n_steps = close.shape[0]
+
+    # Evening of the i-th day: close out the open positions and realise PnL
+    realised = 0.0
+    for k in prange(n_tickers):
+        if abs(trades_shares[k]) > 1e-6:
+            pnl = (close[i, k] - trades_price[k]) * trades_shares[k]
+            realised += abs(trades_price[k] * trades_shares[k]) + pnl
+        trades_price[k] = 0.0
+        trades_shares[k] = 0.0
+    cash[i] += realised
+
+    # Transform the alphas onto a -1 to +1 range. Integral of position should
+    # be total cash available.
+    total = _normalize_alphas(alphas)
+
+    # A flat alpha vector carries no signal: place no orders
+    if total == 0.0:
+        for k in range(n_tickers):
+            orders[k] = 0.0
+        if i + 1 < n_steps:
+            cash[i + 1] = cash[i]
+        return
+
+    # Number of shares is the position value / closing price of the day
+    for k in prange(n_tickers):
+        orders[k] = (alphas[k] / total) * cash[i] / close[i, k]
+
+    # Morning of the i+1-th day, if there is one: convert orders to trades at
+    # the open
+    if i + 1 == n_steps:
+        return
+    cash[i + 1] = cash[i]
+    costs = np.empty(n_tickers)
+    for k in prange(n_tickers):
+        costs[k] = abs(orders[k]) * open_[i + 1, k]
+    # Fill the orders in priority order (strongest |alpha| first) until the
+    # running cost exceeds the cash carried into the morning. The prefix sum
+    # plus a single searchsorted replaces N data-dependent branches and N
+    # scalar cash decrements, and the spend can never overshoot the account.
+    priority = np.argsort(-np.abs(alphas))
+    cum = np.cumsum(costs[priority])
+    n_placed = np.searchsorted(cum, cash[i + 1], side="right")
+    for j in range(n_placed):
+        k = priority[j]
+        trades_price[k] = open_[i + 1, k]
+        trades_shares[k] = orders[k]
+    if n_placed > 0:
+        cash[i + 1] -= cum[n_placed - 1]
+
+
+class TradeHistory:
+    """Structure-of-arrays record of every trade taken during a run.
+
+    Appending rows to a DataFrame reindexes and copies the frame on every
+    trade, which is quadratic over a run. The fields are instead pre-allocated
+    flat arrays written at a cursor, and a DataFrame is only built once on
+    demand via :meth:`to_frame`.
+    """
 
-    TODO: This doesn't check open positions, and so all open positions must be
-     closed out after each period (fine when ignoring any transaction fees).
+    def __init__(self, capacity: int) -> None:
+        self.symbol_idx = np.zeros(capacity, dtype=np.int32)
+        self.open_price = np.zeros(capacity, dtype=np.float32)
+        self.shares = np.zeros(capacity, dtype=np.float32)
+        self.close_price = np.zeros(capacity, dtype=np.float32)
+        self.pnl = np.zeros(capacity, dtype=np.float32)
+        self._n = 0
 
-    Args:
-      name (str): The reference name of the universe file to be loaded.
+    def __len__(self) -> int:
+        return self._n
 
-    Returns:
-      pd.DataFrame: The universe of securities.
-    """
-    return abs(shares * price) <= cash
+    def open(self, symbol_idx: np.ndarray, open_price: np.ndarray, shares: np.ndarray) -> np.ndarray:
+        """Record a batch of newly opened trades and return their history indices.
 
+        Args:
+            symbol_idx (np.ndarray): Ticker indices of the opened trades.
+            open_price (np.ndarray): Prices the trades were opened at.
+            shares (np.ndarray): Number of shares of each trade.
 
-# @dataclass
-# class Order:
-#     ticker: str
-#     shares: float
+        Returns:
+            np.ndarray: The indices of the new records, to be passed to ``close``.
+        """
+        idx = np.arange(self._n, self._n + symbol_idx.size)
+        self.symbol_idx[idx] = symbol_idx
+        self.open_price[idx] = open_price
+        self.shares[idx] = shares
+        self._n += symbol_idx.size
+        return idx
 
-#     def eligible(self, price: float, cash: float) -> bool:
-#         """Checks whether the order can be placed.
+    def close(self, idx: np.ndarray, close_price: np.ndarray, pnl: np.ndarray) -> None:
+        """Record the closing price and PnL of previously opened trades.
 
-#         When trying to long a position, we need enough cash. When trying to short,
-#         we also need to make sure that we have enough cash for it.
+        Args:
+            idx (np.ndarray): History indices returned by ``open``.
+            close_price (np.ndarray): Prices the trades were closed at.
+            pnl (np.ndarray): Profit and loss realised by each trade.
+        """
+        self.close_price[idx] = close_price
+        self.pnl[idx] = pnl
 
-#         TODO: This doesn't check open positions, and so all open positions must be
-#          closed out after each period (fine when ignoring any transaction fees).
+    def to_frame(self, tickers: list) -> pd.DataFrame:
+        """Build the trade history ``pd.DataFrame`` in one shot from the arrays.
 
-#         Args:
-#           name (str): The reference name of the universe file to be loaded.
+        Args:
+            tickers (list): Universe tickers used to resolve symbol names.
 
-#         Returns:
-#           pd.DataFrame: The universe of securities.
-#         """
-#         return abs(self.shares * price) <= cash
+        Returns:
+            pd.DataFrame: One row per trade taken during the run.
+        """
+        n = self._n
+        return pd.DataFrame(
+            {
+                "symbol": np.asarray(tickers)[self.symbol_idx[:n]],
+                "open_price": self.open_price[:n],
+                "shares": self.shares[:n],
+                "close_price": self.close_price[:n],
+                "PnL": self.pnl[:n],
+            }
+        )
+
+
+class Trade:
+    """Open positions held as one structure-of-arrays matrix.
+
+    The id/price/shares vectors are rows of a single contiguous matrix so
+    that clearing is one memset rather than three, and the open-trade check
+    is a single vectorised comparison rather than per-ticker ``abs`` calls.
+    """
+
+    def __init__(self, universe_size: int) -> None:
+        self._data = np.zeros((3, universe_size), dtype=np.float32)
+        self.id = self._data[0]
+        self.price = self._data[1]
+        self.shares = self._data[2]
+
+    def open_mask(self) -> np.ndarray:
+        """Mask of the tickers that currently have an open trade.
+
+        Returns:
+            np.ndarray: Boolean vector, True where the shares are non-zero.
+        """
+        return np.abs(self.shares) > 1e-6
 
 
 class StrategyException(Exception):
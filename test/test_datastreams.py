@@ -0,0 +1,47 @@
+import pandas as pd
+import backtester.datastreams as datastreams
+
+
+def test_csv_timeseries_engine_parity(monkeypatch):
+    """Tests that the pyarrow fast path matches the C-engine fallback."""
+    fast = datastreams.csv_timeseries("test/1yr_snp.csv")
+
+    def no_pyarrow(filename):
+        raise ImportError("pyarrow is not installed")
+
+    monkeypatch.setattr(datastreams, "_pyarrow_timeseries", no_pyarrow)
+    slow = datastreams.csv_timeseries("test/1yr_snp.csv")
+    pd.testing.assert_frame_equal(fast, slow)
+
+
+def test_csv_timeseries_chunked():
+    """Tests streaming the csv in fixed-size row chunks."""
+    full = datastreams.csv_timeseries("test/1yr_snp.csv")
+    chunks = list(datastreams.csv_timeseries("test/1yr_snp.csv", chunksize=25))
+    assert [len(chunk) for chunk in chunks] == [25, 25, 10]
+    stitched = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(stitched, full)
+
+
+def test_parquet_cache_reuse(tmp_path, monkeypatch):
+    """Tests that a second identical request is served from the parquet cache."""
+    calls = []
+
+    def fake_history(ticks, start, end, interval):
+        calls.append(ticks)
+        return pd.DataFrame({"Open": [1.0, 2.0], "Adj Close": [1.5, 2.5]})
+
+    monkeypatch.setattr(datastreams, "_get_history", fake_history)
+
+    first = datastreams.yf_timeseries(["AAPL", "MSFT"], cache_dir=str(tmp_path))
+    second = datastreams.yf_timeseries(["AAPL", "MSFT"], cache_dir=str(tmp_path))
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # A different request misses the cache and downloads again
+    datastreams.yf_timeseries(["GOOG"], cache_dir=str(tmp_path))
+    assert len(calls) == 2
+
+    # An expired cache entry is re-downloaded
+    datastreams.yf_timeseries(["AAPL", "MSFT"], cache_dir=str(tmp_path), cache_ttl=0.0)
+    assert len(calls) == 3
@@ -2,13 +2,13 @@ from datetime import datetime
 import random
 import pytest
 import numpy as np
-from backtester.engine import Engine, StrategyException
+from backtester.engine import DataView, Engine, StrategyException
 import backtester.datastreams as datastreams
 
 
 def test_strategy_length():
     """Tests whether the strategy is producing a valid alpha vector."""
-    data = datastreams.csv_timeseries(filename="1yr_snp.csv")
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
     model = Engine(1000, data, strat1, context=1)
     with pytest.raises(StrategyException):
         model.run()
@@ -16,7 +16,7 @@ def test_strategy_length():
 
 def test_strategy_success():
     """Tests whether the strategy is producing a valid alpha vector."""
-    data = datastreams.csv_timeseries(filename="1yr_snp.csv")
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
     model = Engine(1000, data, strat2, context=1)
     try:
         model.run()
@@ -24,6 +24,87 @@ def test_strategy_success():
         assert False
 
 
+def test_dataview_slicing():
+    """Tests that the strategy input is a zero-copy slice up to the current step."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    model = Engine(1000, data, strat2, context=1)
+    view = DataView(model._cols, 9)
+    assert len(view) == 10
+    closes = view["Adj Close"]
+    assert closes.shape == (10, len(model.tickers))
+    # The slice is a view into the engine's own array, not a copy
+    assert closes.base is model.closes
+
+
+def test_trade_history():
+    """Tests that every trade is recorded and the PnL reconciles with cash."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    model = Engine(1000, data, strat2, context=1)
+    model.run()
+    history = model.history.to_frame(model.tickers)
+    assert list(history.columns) == [
+        "symbol",
+        "open_price",
+        "shares",
+        "close_price",
+        "PnL",
+    ]
+    assert len(history) == model.pos_id
+    # All value spent on trades is returned with PnL on close-out
+    assert model.cash[-1] == pytest.approx(1000 + history["PnL"].sum())
+    # The morning spend can never overshoot the account
+    assert np.all(model.cash >= 0)
+
+
+def test_cash_drift():
+    """Tests the float64 cash curve shows no drift against a Kahan-summed PnL."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    model = Engine(1000, data, strat2, context=1)
+    model.run()
+    pnls = model.history.to_frame(model.tickers)["PnL"].to_numpy(dtype=np.float64)
+    # Kahan-compensated reference sum of the realised PnL
+    total = 0.0
+    comp = 0.0
+    for pnl in pnls:
+        y = pnl - comp
+        t = total + y
+        comp = (t - total) - y
+        total = t
+    assert model.cash[-1] == pytest.approx(1000 + total)
+
+
+def test_flat_alphas():
+    """Tests that a flat alpha vector places no orders instead of dividing by zero."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    model = Engine(1000, data, strat3, context=1)
+    model.run()
+    assert model.pos_id == 0
+    assert np.all(model.cash == 1000)
+
+
+def test_ticker_lookup():
+    """Tests the ticker-to-column maps and name-based DataView slicing."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    model = Engine(1000, data, strat2, context=1)
+    col = model.ticker_to_col["MSFT"]
+    assert model.tickers[col] == "MSFT"
+    assert model.typed_ticker_to_col["MSFT"] == col
+    view = DataView(model._cols, 9, model.ticker_to_col)
+    np.testing.assert_array_equal(
+        view.column("Adj Close", "MSFT"), model.closes[:10, col]
+    )
+
+
+def test_run_many():
+    """Tests running several strategies in parallel over the same timeseries."""
+    data = datastreams.csv_timeseries(filename="test/1yr_snp.csv")
+    curves = Engine.run_many([strat2, strat3], 1000, data, max_workers=2)
+    assert len(curves) == 2
+    assert all(len(curve) == len(data) for curve in curves)
+    # The degenerate strategy never trades, so its curve stays flat
+    assert np.all(curves[1] == 1000)
+
+
 def strat1(data, context):
     """
     Purpose: one
@@ -45,3 +126,11 @@ def strat2(data, context):
     """
     closing = data["Adj Close"].T
     return np.array([random.uniform(-1, 1) for _ in range(len(closing))])
+
+
+def strat3(data, context):
+    """
+    Purpose: one
+    A degenerate strategy whose alphas carry no signal at all.
+    """
+    return np.ones(len(data["Adj Close"].T))